@@ -1,5 +1,7 @@
 import streamlit as st
 from predict import MaternalHealthPredictor
+from evaluate import is_report_current, load_report
+from history import PatientHistory
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
@@ -100,6 +102,27 @@ def load_predictor():
     """Initialize the predictor once"""
     return MaternalHealthPredictor()
 
+@st.cache_resource
+def load_history():
+    """Open the patient history store once"""
+    return PatientHistory()
+
+def load_model_summary(model):
+    """Model type, and accuracy (with overrides) with its confidence interval from the evaluation report
+
+    Not cached: the report may be regenerated, or the model retrained, while the app is running.
+    The accuracy is only shown if the report matches the deployed model, test data and code.
+    """
+    report = load_report()
+    if report is None:
+        return type(model).__name__, "Run evaluate.py"
+    if not is_report_current(report):
+        return type(model).__name__, "Stale, rerun evaluate.py"
+    accuracy = report['with_overrides']['metrics']['accuracy'] * 100
+    ci = report['with_overrides']['confidence_intervals']['accuracy']
+    level = report['confidence'] * 100
+    return report['model'], f"{accuracy:.1f}% ({level:.0f}% CI {ci['low']*100:.1f}-{ci['high']*100:.1f}%)"
+
 # Initialize predictor
 predictor = load_predictor()
 
@@ -142,9 +165,10 @@ with st.sidebar:
             st.success(f"**{celsius}°C = {fahrenheit:.1f}°F**")    
     
     st.header(" Model Info")
+    model_type, accuracy_summary = load_model_summary(predictor.model)
     st.success(f"""
-    - **Model Type**: Random Forest
-    - **Accuracy**: 95%+
+    - **Model Type**: {model_type}
+    - **Accuracy**: {accuracy_summary}
     - **Features**: 6 health parameters
     """)
     
@@ -170,6 +194,21 @@ with st.sidebar:
 # Main content
 st.header(" Enter Patient Information")
 
+history_col1, history_col2 = st.columns(2)
+
+with history_col1:
+    patient_id = st.text_input(
+        "Patient ID (optional)",
+        placeholder="Enter patient ID (e.g., P-1024)",
+        help="Show the patient's risk trend and enable saving this visit to their history"
+    ).strip()
+
+with history_col2:
+    visit_date = st.date_input(
+        "Visit Date",
+        help="Date of this prenatal visit"
+    )
+
 # Create two columns for inputs
 col1, col2 = st.columns(2)
 
@@ -221,7 +260,7 @@ with col2:
 st.markdown("---")
 
 
-button_col1, button_col2  = st.columns(2)
+button_col1, button_col2, button_col3 = st.columns(3)
 
 with button_col1:
     predict_button = st.button("Predict Risk Level", use_container_width=True)
@@ -229,6 +268,14 @@ with button_col1:
 with button_col2:
     dashboard_button = st.button("View Dashboard", use_container_width=True)
 
+with button_col3:
+    save_button = st.button(
+        "Save Visit",
+        use_container_width=True,
+        disabled=not patient_id,
+        help="Save the last prediction to the patient's history (enter a Patient ID first)"
+    )
+
 
 
 def create_health_dashboard(age_val, systolic_val, diastolic_val, bs_val, temp_val, hr_val):
@@ -385,6 +432,48 @@ def create_health_dashboard(age_val, systolic_val, diastolic_val, bs_val, temp_v
         )
 
 
+def show_patient_trend(trend):
+    """Render a patient's risk trend from the history aggregates"""
+
+    st.markdown("---")
+    st.header("Patient Risk Trend")
+
+    if trend is None:
+        st.info("No visits recorded for this patient yet.")
+        return
+
+    trend_col1, trend_col2, trend_col3 = st.columns(3)
+
+    with trend_col1:
+        st.metric(
+            "Visits",
+            trend['n_visits'],
+            help=f"{trend['first_visit']} to {trend['last_visit']}"
+        )
+
+    with trend_col2:
+        st.metric(
+            "Current Risk",
+            trend['last_risk_level'].upper(),
+            help=f"Highest recorded: {trend['max_risk_level']}"
+        )
+
+    with trend_col3:
+        bp_delta = None
+        if trend['systolic_trend'] is not None:
+            bp_delta = f"{trend['systolic_trend']:+.1f}/{trend['diastolic_trend']:+.1f} mmHg per week"
+        st.metric(
+            "Blood Pressure",
+            f"{trend['last_systolic']:.0f}/{trend['last_diastolic']:.0f} mmHg",
+            delta=bp_delta,
+            delta_color="inverse"
+        )
+
+    if trend['last_transition']:
+        change = trend['last_transition']
+        st.info(f"Risk changed from **{change['from']}** to **{change['to']}** on {change['date']}")
+
+
 if predict_button:
     
    
@@ -419,7 +508,7 @@ if predict_button:
                 st.error(f"• {error}")
         else:
            
-            result = predictor.predict(
+            result = predictor.predict_result(
                 age=age_val,
                 systolic_bp=systolic_val,
                 diastolic_bp=diastolic_val,
@@ -429,15 +518,11 @@ if predict_button:
             )
             
          
-            risk_level = result['risk_level']
-            confidence_str = result['confidence']  
-            probabilities_dict = result['probabilities']  
-            
-           
-            confidence = confidence_str
+            risk_level = result.risk_level
+            confidence = result.confidence.label
 
       
-            prob_values = {k: float(v.rstrip('%')) for k, v in probabilities_dict.items()}
+            prob_values = {name: prob * 100 for name, prob in zip(result.class_names, result.probabilities)}
             
         
             st.markdown("---")
@@ -589,8 +674,8 @@ if predict_button:
   
             st.subheader("Probability Table")
             prob_table = pd.DataFrame({
-                'Risk Level': list(probabilities_dict.keys()),
-                'Probability': list(probabilities_dict.values())
+                'Risk Level': list(prob_values.keys()),
+                'Probability': [f"{prob:.2f}%" for prob in prob_values.values()]
             })
             st.table(prob_table)
             
@@ -602,6 +687,15 @@ if predict_button:
                 'Unit': ['years', 'mmHg', 'mmHg', 'mmol/L', '°F', 'bpm']
             })
             st.table(input_summary)
+
+            # Kept for the Save Visit button, which runs in a later rerun
+            st.session_state['last_prediction'] = {
+                'vitals': (age_val, systolic_val, diastolic_val, bs_val, temp_val, hr_val),
+                'result': result,
+            }
+
+            if patient_id:
+                show_patient_trend(load_history().trend(patient_id))
     
     except ValueError:
         st.error("**Invalid Input!** Please enter valid numbers in all fields.")
@@ -612,6 +706,27 @@ if predict_button:
         st.info("Please check your inputs and try again.")
 
 
+if save_button:
+    last_prediction = st.session_state.get('last_prediction')
+    try:
+        current_vitals = tuple(map(float, (age, systolic_bp, diastolic_bp, blood_sugar, body_temp, heart_rate)))
+    except ValueError:
+        current_vitals = None
+
+    if last_prediction is None or last_prediction['vitals'] != current_vitals:
+        st.warning("Predict the risk level for the values entered before saving the visit.")
+    else:
+        history = load_history()
+        _, status = history.record_visit(patient_id, visit_date, current_vitals, last_prediction['result'])
+        if status == 'unchanged':
+            st.info(f"This visit is already saved for patient {patient_id} on {visit_date}.")
+        elif status == 'replaced':
+            st.success(f"Visit of {visit_date} updated for patient {patient_id}.")
+        else:
+            st.success(f"Visit saved for patient {patient_id}.")
+        show_patient_trend(history.trend(patient_id))
+
+
 if dashboard_button:
     try:
       
@@ -645,6 +760,9 @@ if dashboard_button:
         else:
            
             create_health_dashboard(age_val, systolic_val, diastolic_val, bs_val, temp_val, hr_val)
+
+            if patient_id:
+                show_patient_trend(load_history().trend(patient_id))
     
     except ValueError:
         st.error("**Invalid Input!** Please enter valid numbers in all fields before viewing dashboard.")
@@ -0,0 +1,571 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import cycle
+
+import numpy as np
+import pandas as pd
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import seaborn as sns
+from sklearn.metrics import roc_curve, precision_recall_curve
+
+from evaluate import (MODEL_PATH, SCALER_PATH, MAPPING_PATH, X_TEST_PATH, Y_TEST_PATH, W_TEST_PATH,
+                      code_sha256, compute_metrics, file_sha256, load_test_predictions)
+
+DATASET_PATH = 'data/raw_data/maternal_health_clean.csv'
+X_TRAIN_PATH = 'data/processed_data/X_train.csv'
+FEATURE_NAMES_PATH = 'models/feature_names.pkl'
+COMPARISON_PATH = 'output/model_comparison_results.csv'
+FIGURES_DIR = 'output/visualizations'
+CACHE_DIR = 'output/.cache'
+MANIFEST_PATH = os.path.join(FIGURES_DIR, '.manifest.json')
+
+MODEL_BUNDLE = [MODEL_PATH, SCALER_PATH, MAPPING_PATH]
+TEST_DATA = [X_TEST_PATH, Y_TEST_PATH]
+
+
+# ---------------------------------------------------------------------------
+# Inputs: raw files are read directly, computed arrays are cached as .npz.
+# 'deps' must exist; 'optional' files are only hashed when present.
+# ---------------------------------------------------------------------------
+
+def _load_dataset():
+    return pd.read_csv(DATASET_PATH)
+
+
+def _load_comparison():
+    return pd.read_csv(COMPARISON_PATH).sort_values('Accuracy', ascending=False)
+
+
+def _compute_predictions():
+    """Test-set predictions and metrics shared by every model figure"""
+    model, _, class_names, _, y_test, y_pred, y_proba, w_test = load_test_predictions()
+    metrics = compute_metrics(y_test, y_pred, y_proba, class_names, w_test)
+    per_class = [metrics['per_class'][name] for name in class_names]
+
+    return {
+        'model_name': np.array(type(model).__name__),
+        'class_names': np.array(class_names),
+        'y_test': y_test,
+        'y_pred': y_pred,
+        'y_proba': y_proba,
+        'w_test': w_test,
+        'confusion_matrix': np.array(metrics['confusion_matrix']),
+        **{
+            key: np.array([scores[key] for scores in per_class])
+            for key in ['precision', 'recall', 'f1', 'roc_auc', 'average_precision']
+        },
+    }
+
+
+def _compute_importances():
+    """Feature importances (or absolute coefficients) of the saved model"""
+    with open(MODEL_PATH, 'rb') as f:
+        model = pickle.load(f)
+    with open(FEATURE_NAMES_PATH, 'rb') as f:
+        feature_names = pickle.load(f)
+
+    if hasattr(model, 'feature_importances_'):
+        importances = model.feature_importances_
+    elif hasattr(model, 'coef_'):
+        importances = np.abs(model.coef_[0])
+    else:
+        raise ValueError(f"Feature importance not available for {type(model).__name__}")
+
+    return {
+        'model_name': np.array(type(model).__name__),
+        'features': np.array(feature_names),
+        'importances': importances,
+    }
+
+
+def _compute_scaled_train():
+    """Training features before and after scaling"""
+    X_train = pd.read_csv(X_TRAIN_PATH)
+    with open(SCALER_PATH, 'rb') as f:
+        scaler = pickle.load(f)
+
+    return {
+        'columns': np.array(X_train.columns.tolist()),
+        'raw': X_train.to_numpy(dtype=float),
+        'scaled': scaler.transform(X_train),
+    }
+
+
+INPUTS = {
+    'dataset': {'deps': [DATASET_PATH], 'load': _load_dataset, 'cached': False},
+    'comparison': {'deps': [COMPARISON_PATH], 'load': _load_comparison, 'cached': False},
+    'predictions': {'deps': MODEL_BUNDLE + TEST_DATA, 'optional': [W_TEST_PATH],
+                    'load': _compute_predictions, 'cached': True},
+    'importances': {'deps': [MODEL_PATH, FEATURE_NAMES_PATH], 'load': _compute_importances, 'cached': True},
+    'scaled_train': {'deps': [X_TRAIN_PATH, SCALER_PATH], 'load': _compute_scaled_train, 'cached': True},
+}
+
+
+def _input_files(name):
+    """Files an input is read from: its dependencies and whichever optional files exist"""
+    optional = INPUTS[name].get('optional', [])
+    return INPUTS[name]['deps'] + [path for path in optional if os.path.exists(path)]
+
+
+def _cache_path(name):
+    """Cache file for a computed input, keyed on its files and the code computing it"""
+    digest = hashlib.sha256()
+    for path in _input_files(name):
+        digest.update(file_sha256(path).encode())
+    digest.update(code_sha256(INPUTS[name]['load']).encode())
+    return os.path.join(CACHE_DIR, f'{name}-{digest.hexdigest()[:16]}.npz')
+
+
+def _prepare_input(name):
+    """Compute a cached input once, before figures are handed to the workers"""
+    path = _cache_path(name)
+    if not os.path.exists(path):
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        np.savez(path, **INPUTS[name]['load']())
+
+    # Drop the input's entries for older keys
+    for stale in glob.glob(os.path.join(CACHE_DIR, f'{name}-*.npz')):
+        if stale != path:
+            os.remove(stale)
+
+
+def _load_input(name):
+    if not INPUTS[name]['cached']:
+        return INPUTS[name]['load']()
+    with np.load(_cache_path(name)) as data:
+        return {key: data[key] for key in data.files}
+
+
+# ---------------------------------------------------------------------------
+# Figure targets
+# ---------------------------------------------------------------------------
+
+FIGURES = {}
+
+
+def figure(filename, inputs):
+    """Register a figure target rendered from the named inputs"""
+    def register(render):
+        FIGURES[filename] = {'render': render, 'inputs': inputs}
+        return render
+    return register
+
+
+@figure('target_distribution.png', ['dataset'])
+def target_distribution(df):
+    fig, ax = plt.subplots(figsize=(8, 5))
+    df['RiskLevel'].value_counts().plot(kind='bar', color=['green', 'orange', 'red'], ax=ax)
+    ax.set_title('Risk Level Distribution')
+    ax.set_xlabel('Risk Level')
+    ax.set_ylabel('Counts')
+    ax.tick_params(axis='x', rotation=0)
+    return fig
+
+
+@figure('feature_distributions.png', ['dataset'])
+def feature_distributions(df):
+    fig, axes = plt.subplots(2, 3, figsize=(15, 10))
+    df.hist(bins=20, edgecolor='black', ax=axes)
+    return fig
+
+
+@figure('boxplots.png', ['dataset'])
+def boxplots(df):
+    fig, axes = plt.subplots(2, 3, figsize=(12, 6))
+    df.plot(kind='box', subplots=True, ax=axes.ravel())
+    return fig
+
+
+@figure('Correlation_heatmap.png', ['dataset'])
+def correlation_heatmap(df):
+    fig, ax = plt.subplots(figsize=(10, 8))
+    sns.heatmap(df.corr(numeric_only=True), annot=True, fmt='.2f', cmap='coolwarm',
+                center=0, square=True, linewidths=1, ax=ax)
+    ax.set_title('Correlation Matrix')
+    return fig
+
+
+@figure('Pairplot.png', ['dataset'])
+def pairplot(df):
+    return sns.pairplot(df, hue='RiskLevel', palette='Set1').figure
+
+
+@figure('boxplots_by_risk.png', ['dataset'])
+def boxplots_by_risk(df):
+    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+
+    fig, axes = plt.subplots(2, 3, figsize=(16, 10))
+    axes = axes.ravel()
+    for idx, col in enumerate(numeric_cols[:len(axes)]):
+        df.boxplot(column=col, by='RiskLevel', ax=axes[idx])
+        axes[idx].set_title(f'{col} by Risk Level')
+    for ax in axes[len(numeric_cols):]:
+        ax.axis('off')
+
+    fig.suptitle('')
+    return fig
+
+
+@figure('scaling_comparison.png', ['scaled_train'])
+def scaling_comparison(train):
+    age = list(train['columns']).index('Age')
+
+    fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+    axes[0].hist(train['raw'][:, age], bins=20, edgecolor='black', color='steelblue')
+    axes[0].set_title('Before Scaling - Age Distribution')
+    axes[0].set_xlabel('Age')
+    axes[0].set_ylabel('Frequency')
+
+    axes[1].hist(train['scaled'][:, age], bins=20, edgecolor='black', color='coral')
+    axes[1].set_title('After Scaling - Age Distribution')
+    axes[1].set_xlabel('Scaled Age')
+    axes[1].set_ylabel('Frequency')
+    return fig
+
+
+@figure('model_comparison.png', ['comparison'])
+def model_comparison(results_df):
+    metrics = ['Accuracy', 'Precision', 'Recall', 'F1-Score']
+    lower = max(0.0, results_df[metrics].min().min() - 0.05)
+
+    fig, axes = plt.subplots(2, 2, figsize=(16, 12))
+
+    # 1. Accuracy Comparison
+    axes[0, 0].barh(results_df['Model'], results_df['Accuracy'], color='steelblue')
+    axes[0, 0].set_xlabel('Accuracy', fontsize=11)
+    axes[0, 0].set_title('Model Accuracy Comparison', fontsize=12, fontweight='bold')
+    axes[0, 0].set_xlim([lower, 1.0])
+    for i, v in enumerate(results_df['Accuracy']):
+        axes[0, 0].text(v + 0.005, i, f'{v:.4f}', va='center', fontsize=9)
+
+    # 2. All Metrics Comparison
+    x = np.arange(len(results_df))
+    width = 0.2
+    for i, metric in enumerate(metrics):
+        axes[0, 1].bar(x + i*width, results_df[metric], width, label=metric, alpha=0.8)
+    axes[0, 1].set_xlabel('Models', fontsize=11)
+    axes[0, 1].set_ylabel('Score', fontsize=11)
+    axes[0, 1].set_title('Performance Metrics Comparison', fontsize=12, fontweight='bold')
+    axes[0, 1].set_xticks(x + width * 1.5)
+    axes[0, 1].set_xticklabels(results_df['Model'], rotation=45, ha='right', fontsize=9)
+    axes[0, 1].legend(fontsize=9)
+    axes[0, 1].set_ylim([lower, 1.0])
+    axes[0, 1].grid(axis='y', alpha=0.3)
+
+    # 3. Training Time Comparison
+    axes[1, 0].bar(results_df['Model'], results_df['Train Time'], color='coral', alpha=0.7)
+    axes[1, 0].set_xlabel('Model', fontsize=11)
+    axes[1, 0].set_ylabel('Training Time (seconds)', fontsize=11)
+    axes[1, 0].set_title('Training Time Comparison', fontsize=12, fontweight='bold')
+    axes[1, 0].tick_params(axis='x', rotation=45)
+    for i, v in enumerate(results_df['Train Time']):
+        axes[1, 0].text(i, v + 0.01, f'{v:.3f}s', ha='center', va='bottom', fontsize=9)
+
+    # 4. F1-Score vs ROC-AUC
+    axes[1, 1].scatter(results_df['F1-Score'], results_df['ROC-AUC'],
+                       s=200, alpha=0.6, c=range(len(results_df)), cmap='viridis')
+    for i, txt in enumerate(results_df['Model']):
+        axes[1, 1].annotate(txt, (results_df['F1-Score'].iloc[i], results_df['ROC-AUC'].iloc[i]),
+                            fontsize=8, ha='center', va='bottom')
+    axes[1, 1].set_xlabel('F1-Score', fontsize=11)
+    axes[1, 1].set_ylabel('ROC-AUC', fontsize=11)
+    axes[1, 1].set_title('F1-Score vs ROC-AUC', fontsize=12, fontweight='bold')
+    axes[1, 1].grid(True, alpha=0.3)
+    return fig
+
+
+@figure('cross_validation_scores.png', ['comparison'])
+def cross_validation_scores(results_df):
+    lower = max(0.0, (results_df['CV Score'] - results_df['CV Std']).min() - 0.05)
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.barh(results_df['Model'], results_df['CV Score'],
+            xerr=results_df['CV Std'], capsize=5,
+            color='mediumseagreen', alpha=0.7)
+    ax.set_xlabel('Cross-Validation Score (5-Fold)', fontsize=12)
+    ax.set_title('Cross-Validation Performance', fontsize=14, fontweight='bold')
+    ax.set_xlim([lower, 1.0])
+    ax.grid(axis='x', alpha=0.3)
+    for i, (score, std) in enumerate(zip(results_df['CV Score'], results_df['CV Std'])):
+        ax.text(score + 0.005, i, f'{score:.4f}±{std:.4f}', va='center', fontsize=9)
+    return fig
+
+
+@figure('confusion_matrix_best_model.png', ['predictions'])
+def confusion_matrix_best_model(pred):
+    class_names = list(pred['class_names'])
+    fig, ax = plt.subplots(figsize=(10, 8))
+    sns.heatmap(pred['confusion_matrix'], annot=True, fmt='d', cmap='Blues',
+                xticklabels=class_names, yticklabels=class_names,
+                cbar_kws={'label': 'Count'}, linewidths=1, linecolor='gray', ax=ax)
+    ax.set_title(f"Confusion Matrix - {pred['model_name']}", fontsize=14, fontweight='bold', pad=20)
+    ax.set_ylabel('Actual Risk Level', fontsize=12)
+    ax.set_xlabel('Predicted Risk Level', fontsize=12)
+    return fig
+
+
+@figure('confusion_matrix_detailed.png', ['predictions'])
+def confusion_matrix_detailed(pred):
+    class_names = list(pred['class_names'])
+    cm = pred['confusion_matrix']
+    cm_percent = cm.astype('float') / cm.sum(axis=1)[:, np.newaxis] * 100
+
+    fig, axes = plt.subplots(1, 2, figsize=(16, 6))
+    for ax, values, fmt, cmap, label, title in [
+        (axes[0], cm, 'd', 'Blues', 'Count', 'Confusion Matrix - Counts'),
+        (axes[1], cm_percent, '.2f', 'Greens', 'Percentage (%)', 'Confusion Matrix - Percentages'),
+    ]:
+        sns.heatmap(values, annot=True, fmt=fmt, cmap=cmap,
+                    xticklabels=class_names, yticklabels=class_names,
+                    cbar_kws={'label': label}, linewidths=2, linecolor='white', ax=ax)
+        ax.set_title(title, fontsize=14, fontweight='bold', pad=15)
+        ax.set_ylabel('Actual Risk Level', fontsize=12)
+        ax.set_xlabel('Predicted Risk Level', fontsize=12)
+    return fig
+
+
+@figure('per_class_performance.png', ['predictions'])
+def per_class_performance(pred):
+    class_names = list(pred['class_names'])
+    x = np.arange(len(class_names))
+    width = 0.25
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.bar(x - width, pred['precision'], width, label='Precision', alpha=0.8)
+    ax.bar(x, pred['recall'], width, label='Recall', alpha=0.8)
+    ax.bar(x + width, pred['f1'], width, label='F1-Score', alpha=0.8)
+    ax.set_xlabel('Risk Level', fontsize=12)
+    ax.set_ylabel('Score', fontsize=12)
+    ax.set_title('Per-Class Performance Metrics', fontsize=14, fontweight='bold')
+    ax.set_xticks(x)
+    ax.set_xticklabels(class_names)
+    ax.legend(fontsize=10)
+    ax.set_ylim([0, 1.05])
+    ax.grid(axis='y', alpha=0.3)
+    return fig
+
+
+@figure('roc_curves.png', ['predictions'])
+def roc_curves(pred):
+    colors = cycle(['blue', 'red', 'green', 'orange', 'purple'])
+
+    fig, ax = plt.subplots(figsize=(10, 8))
+    for i, (name, color) in enumerate(zip(pred['class_names'], colors)):
+        fpr, tpr, _ = roc_curve(pred['y_test'] == i, pred['y_proba'][:, i], sample_weight=pred['w_test'])
+        ax.plot(fpr, tpr, color=color, lw=2, label=f"{name} (AUC = {pred['roc_auc'][i]:.4f})")
+
+    ax.plot([0, 1], [0, 1], 'k--', lw=2, label='Random Classifier')
+    ax.set_xlim([0.0, 1.0])
+    ax.set_ylim([0.0, 1.05])
+    ax.set_xlabel('False Positive Rate', fontsize=12)
+    ax.set_ylabel('True Positive Rate', fontsize=12)
+    ax.set_title('ROC Curves - Multi-Class', fontsize=14, fontweight='bold')
+    ax.legend(loc="lower right", fontsize=10)
+    ax.grid(alpha=0.3)
+    return fig
+
+
+@figure('precision_recall_curves.png', ['predictions'])
+def precision_recall_curves(pred):
+    colors = cycle(['blue', 'red', 'green', 'orange', 'purple'])
+
+    fig, ax = plt.subplots(figsize=(10, 8))
+    for i, (name, color) in enumerate(zip(pred['class_names'], colors)):
+        precision, recall, _ = precision_recall_curve(pred['y_test'] == i, pred['y_proba'][:, i],
+                                                      sample_weight=pred['w_test'])
+        ax.plot(recall, precision, color=color, lw=2,
+                label=f"{name} (AP = {pred['average_precision'][i]:.4f})")
+
+    ax.set_xlabel('Recall', fontsize=12)
+    ax.set_ylabel('Precision', fontsize=12)
+    ax.set_title('Precision-Recall Curves - Multi-Class', fontsize=14, fontweight='bold')
+    ax.legend(loc="lower left", fontsize=10)
+    ax.grid(alpha=0.3)
+    ax.set_xlim([0.0, 1.0])
+    ax.set_ylim([0.0, 1.05])
+    return fig
+
+
+@figure('confidence_analysis.png', ['predictions'])
+def confidence_analysis(pred):
+    max_probas = pred['y_proba'].max(axis=1)
+    weights = pred['w_test']
+    mean = np.average(max_probas, weights=weights)
+
+    fig, axes = plt.subplots(2, 2, figsize=(14, 10))
+    panels = [axes[0, 0], axes[0, 1], axes[1, 0], axes[1, 1]]
+
+    panels[0].hist(max_probas, bins=30, weights=weights, edgecolor='black', color='skyblue', alpha=0.7)
+    panels[0].axvline(mean, color='red', linestyle='--', label=f'Mean: {mean:.3f}')
+    panels[0].set_xlabel('Prediction Confidence', fontsize=11)
+    panels[0].set_ylabel('Frequency', fontsize=11)
+    panels[0].set_title('Overall Prediction Confidence', fontsize=12, fontweight='bold')
+    panels[0].legend()
+    panels[0].grid(axis='y', alpha=0.3)
+
+    # Confidence by predicted class
+    for i, (class_name, ax) in enumerate(zip(pred['class_names'], panels[1:])):
+        predicted = pred['y_pred'] == i
+        class_confidences = max_probas[predicted]
+        if len(class_confidences) == 0:
+            ax.axis('off')
+            continue
+        class_mean = np.average(class_confidences, weights=weights[predicted])
+        ax.hist(class_confidences, bins=20, weights=weights[predicted], edgecolor='black', alpha=0.7)
+        ax.set_xlabel('Confidence', fontsize=11)
+        ax.set_ylabel('Frequency', fontsize=11)
+        ax.set_title(f'Confidence for "{class_name}"', fontsize=12, fontweight='bold')
+        ax.axvline(class_mean, color='red', linestyle='--', label=f'Mean: {class_mean:.3f}')
+        ax.legend()
+        ax.grid(axis='y', alpha=0.3)
+    return fig
+
+
+@figure('prediction_confidence.png', ['predictions'])
+def prediction_confidence(pred):
+    max_probas = pred['y_proba'].max(axis=1)
+    mean = np.average(max_probas, weights=pred['w_test'])
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.hist(max_probas, bins=30, weights=pred['w_test'], edgecolor='black', color='skyblue', alpha=0.7)
+    ax.set_xlabel('Prediction Confidence', fontsize=12)
+    ax.set_ylabel('Frequency', fontsize=12)
+    ax.set_title('Distribution of Prediction Confidence', fontsize=14, fontweight='bold')
+    ax.axvline(mean, color='red', linestyle='--', label=f'Mean: {mean:.3f}')
+    ax.legend(fontsize=10)
+    ax.grid(axis='y', alpha=0.3)
+    return fig
+
+
+@figure('feature_importance.png', ['importances'])
+def feature_importance(imp):
+    order = np.argsort(imp['importances'])[::-1]
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.barh(imp['features'][order], imp['importances'][order], color='steelblue')
+    ax.set_xlabel('Importance', fontsize=12)
+    ax.set_ylabel('Feature', fontsize=12)
+    ax.set_title(f"Feature Importance - {imp['model_name']}", fontsize=14, fontweight='bold')
+    ax.invert_yaxis()
+    return fig
+
+
+# ---------------------------------------------------------------------------
+# Build
+# ---------------------------------------------------------------------------
+
+def _target_deps(filename):
+    return sorted({path for name in FIGURES[filename]['inputs'] for path in INPUTS[name]['deps']})
+
+
+def _target_key(filename):
+    """Hash of a figure's input files and of the code that computes and renders it"""
+    target = FIGURES[filename]
+    digest = hashlib.sha256()
+    for path in sorted({path for name in target['inputs'] for path in _input_files(name)}):
+        digest.update(path.encode())
+        digest.update(file_sha256(path).encode())
+    digest.update(code_sha256(target['render'], *[INPUTS[name]['load'] for name in target['inputs']]).encode())
+    return digest.hexdigest()
+
+
+def _load_manifest():
+    if not os.path.exists(MANIFEST_PATH):
+        return {}
+    with open(MANIFEST_PATH) as f:
+        return json.load(f)
+
+
+def _save_manifest(manifest):
+    with open(MANIFEST_PATH, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+
+def render_figure(filename):
+    """Render one figure to output/visualizations (process-pool worker)"""
+    target = FIGURES[filename]
+    fig = target['render'](*[_load_input(name) for name in target['inputs']])
+    fig.savefig(os.path.join(FIGURES_DIR, filename), dpi=300, bbox_inches='tight')
+    plt.close(fig)
+    return filename
+
+
+def build(targets=None, force=False, n_jobs=None):
+    """Rebuild stale figures in parallel; returns (built, skipped-with-missing-inputs)"""
+    targets = list(FIGURES) if targets is None else targets
+    unknown = [name for name in targets if name not in FIGURES]
+    if unknown:
+        raise ValueError(f"Unknown figures: {', '.join(unknown)}")
+
+    skipped = {}
+    keys = {}
+    for name in targets:
+        missing = [path for path in _target_deps(name) if not os.path.exists(path)]
+        if missing:
+            skipped[name] = missing
+        else:
+            keys[name] = _target_key(name)
+
+    manifest = _load_manifest()
+    stale = [
+        name for name, key in keys.items()
+        if force or manifest.get(name) != key
+        or not os.path.exists(os.path.join(FIGURES_DIR, name))
+    ]
+    if not stale:
+        return [], skipped
+
+    # Shared arrays are computed once here, then read from the cache by every worker
+    for name in sorted({i for target in stale for i in FIGURES[target]['inputs']}):
+        if INPUTS[name]['cached']:
+            _prepare_input(name)
+
+    os.makedirs(FIGURES_DIR, exist_ok=True)
+    built = []
+    try:
+        if n_jobs == 1:
+            for name in stale:
+                built.append(render_figure(name))
+                manifest[name] = keys[name]
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+                futures = [pool.submit(render_figure, name) for name in stale]
+                for future in as_completed(futures):
+                    name = future.result()
+                    built.append(name)
+                    manifest[name] = keys[name]
+    finally:
+        _save_manifest(manifest)
+
+    return built, skipped
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild stale figures in output/visualizations")
+    parser.add_argument('targets', nargs='*', help="Figures to build (default: all)")
+    parser.add_argument('--force', action='store_true', help="Rebuild even if up to date")
+    parser.add_argument('--jobs', type=int, default=None, help="Worker processes (default: all CPUs)")
+    parser.add_argument('--list', action='store_true', help="List figure targets and their inputs")
+    args = parser.parse_args()
+
+    if args.list:
+        for filename in FIGURES:
+            print(f"{filename:<35} {', '.join(_target_deps(filename))}")
+    else:
+        requested = args.targets or list(FIGURES)
+        built, skipped = build(requested, force=args.force, n_jobs=args.jobs)
+
+        print("="*60)
+        print(f"Rebuilt {len(built)} figure(s), {len(requested) - len(built) - len(skipped)} up to date")
+        for name in sorted(built):
+            print(f"  ✅ {name}")
+        for name, missing in skipped.items():
+            print(f"  ⚠️ {name} skipped (missing {', '.join(missing)})")
+        print("="*60)
@@ -0,0 +1,384 @@
+import argparse
+import hashlib
+import inspect
+import json
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from predict import apply_clinical_overrides
+
+MODEL_PATH = 'models/best_model.pkl'
+SCALER_PATH = 'models/scaler.pkl'
+MAPPING_PATH = 'models/risk_mapping.pkl'
+X_TEST_PATH = 'data/processed_data/X_test.csv'
+Y_TEST_PATH = 'data/processed_data/y_test.npy'
+# Duplicate count of every (unique) test row, written by train.py; optional
+W_TEST_PATH = 'data/processed_data/w_test.npy'
+REPORT_PATH = 'output/evaluation_report.json'
+
+# Bump when the report layout changes so cached reports are regenerated
+REPORT_FORMAT = 4
+
+# Bootstrap rounds handed to each worker; fixed so results do not depend on the pool size
+CHUNK_SIZE = 100
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def file_sha256(path):
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _referenced_names(code):
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            names |= _referenced_names(const)
+    return names
+
+
+def code_sha256(*functions):
+    """SHA-256 of the source of the given functions and of every project function they call"""
+    sources = {}
+    pending = list(functions)
+    while pending:
+        fn = pending.pop()
+        # By file rather than __module__, which is '__main__' when the module is run as a script
+        name = f'{os.path.relpath(inspect.getfile(fn), PROJECT_DIR)}:{fn.__qualname__}'
+        if name in sources:
+            continue
+        sources[name] = inspect.getsource(fn)
+        for ref in _referenced_names(fn.__code__):
+            obj = fn.__globals__.get(ref)
+            if inspect.isfunction(obj) and os.path.dirname(os.path.abspath(inspect.getfile(obj))) == PROJECT_DIR:
+                pending.append(obj)
+
+    digest = hashlib.sha256()
+    for name in sorted(sources):
+        digest.update(name.encode())
+        digest.update(sources[name].encode())
+    return digest.hexdigest()
+
+
+def _safe_divide(num, den):
+    """Element-wise num / den with 0 where den is 0 (sklearn's zero_division=0)"""
+    num = np.asarray(num, dtype=float)
+    den = np.asarray(den, dtype=float)
+    return np.divide(num, den, out=np.zeros_like(num), where=den > 0)
+
+
+def _roc_auc(positive, scores, weights):
+    """One-vs-rest ROC-AUC from the Mann-Whitney rank statistic (ties get average ranks)
+
+    A row of weight w ranks as w tied copies of itself.
+    """
+    n_pos = weights[positive].sum()
+    n_neg = weights.sum() - n_pos
+    if n_pos == 0 or n_neg == 0:
+        return np.nan
+
+    _, inverse = np.unique(scores, return_inverse=True)
+    block = np.bincount(inverse, weights=weights)
+    avg_rank = np.cumsum(block) - (block - 1) / 2.0
+    ranks = avg_rank[inverse]
+
+    return (ranks[positive] @ weights[positive] - n_pos * (n_pos + 1) / 2.0) / (n_pos * n_neg)
+
+
+def _average_precision(positive, scores, weights):
+    """Area under the step-wise precision-recall curve, as in sklearn's average_precision_score"""
+    n_pos = weights[positive].sum()
+    if n_pos == 0:
+        return np.nan
+
+    order = np.argsort(-scores, kind='mergesort')
+    hits = positive[order] * weights[order]
+    sorted_scores = scores[order]
+
+    # Evaluate only at the last row of each tied-score block (one point per threshold)
+    last = np.r_[np.flatnonzero(np.diff(sorted_scores)), scores.size - 1]
+    tp = np.cumsum(hits)[last]
+    fp = np.cumsum(weights[order])[last] - tp
+
+    precision = tp / (tp + fp)
+    recall = tp / n_pos
+    return float(np.sum(np.diff(np.r_[0.0, recall]) * precision))
+
+
+def compute_metrics(y_true, y_pred, y_proba, class_names, sample_weight=None):
+    """All evaluation metrics from one confusion matrix and one probability array
+
+    Pass y_proba=None for predictions that are not ranked by those probabilities
+    (e.g. after clinical overrides); ROC-AUC and average precision are then omitted.
+    sample_weight is the integer number of dataset rows each row stands for
+    (see train.deduplicate); every metric counts a row that many times.
+    """
+    n_classes = len(class_names)
+    y_true = np.asarray(y_true, dtype=int)
+    y_pred = np.asarray(y_pred, dtype=int)
+    weights = np.ones(y_true.size) if sample_weight is None else np.asarray(sample_weight, dtype=float)
+
+    cm = np.bincount(y_true * n_classes + y_pred, weights=weights, minlength=n_classes ** 2)
+    cm = cm.astype(int).reshape(n_classes, n_classes)
+    tp = np.diag(cm)
+    support = cm.sum(axis=1)
+    predicted = cm.sum(axis=0)
+
+    precision = _safe_divide(tp, predicted)
+    recall = _safe_divide(tp, support)
+    f1 = _safe_divide(2 * precision * recall, precision + recall)
+    class_weights = support / support.sum()
+
+    metrics = {
+        'accuracy': float(tp.sum() / cm.sum()),
+        'precision_weighted': float(precision @ class_weights),
+        'recall_weighted': float(recall @ class_weights),
+        'f1_weighted': float(f1 @ class_weights),
+        'per_class': {
+            name: {
+                'precision': float(precision[k]),
+                'recall': float(recall[k]),
+                'f1': float(f1[k]),
+                'support': int(support[k]),
+            }
+            for k, name in enumerate(class_names)
+        },
+        'confusion_matrix': cm.tolist(),
+    }
+    if y_proba is None:
+        return metrics
+
+    onehot = y_true[:, None] == np.arange(n_classes)
+    roc_auc = np.array([_roc_auc(onehot[:, k], y_proba[:, k], weights) for k in range(n_classes)])
+    avg_precision = np.array([
+        _average_precision(onehot[:, k], y_proba[:, k], weights) for k in range(n_classes)
+    ])
+
+    present = support > 0
+    metrics['roc_auc_weighted'] = (
+        float(np.sum(roc_auc[present] * class_weights[present]))
+        if not np.isnan(roc_auc[present]).any() else np.nan
+    )
+    for k, name in enumerate(class_names):
+        metrics['per_class'][name]['roc_auc'] = float(roc_auc[k])
+        metrics['per_class'][name]['average_precision'] = float(avg_precision[k])
+    return metrics
+
+
+def _flatten(metrics):
+    """Scalar metrics as a flat {name: value} dict, per-class entries keyed 'class/metric'"""
+    flat = {key: value for key, value in metrics.items() if isinstance(value, float)}
+    for name, scores in metrics['per_class'].items():
+        for key, value in scores.items():
+            if key != 'support':
+                flat[f'{name}/{key}'] = value
+    return flat
+
+
+def _bootstrap_chunk(args):
+    """Run a block of bootstrap rounds for every prediction variant (process-pool worker)"""
+    y_true, predictions, class_names, sample_weight, seed, n_rounds = args
+    rng = np.random.default_rng(seed)
+    n = y_true.size
+
+    samples = {variant: [] for variant in predictions}
+    for _ in range(n_rounds):
+        # Resample unique rows, each carrying its duplicates along
+        idx = rng.integers(0, n, n)
+        for variant, (y_pred, y_proba) in predictions.items():
+            proba = y_proba[idx] if y_proba is not None else None
+            metrics = compute_metrics(y_true[idx], y_pred[idx], proba, class_names, sample_weight[idx])
+            samples[variant].append(_flatten(metrics))
+    return samples
+
+
+def bootstrap_intervals(y_true, predictions, class_names, sample_weight=None,
+                        n_bootstrap=1000, confidence=0.95, seed=42, n_jobs=None):
+    """Percentile bootstrap confidence intervals, computed across a process pool
+
+    predictions maps each variant name to (y_pred, y_proba or None).
+    """
+    if sample_weight is None:
+        sample_weight = np.ones(y_true.size)
+    n_chunks = -(-n_bootstrap // CHUNK_SIZE)
+    seeds = np.random.SeedSequence(seed).spawn(n_chunks)
+    jobs = [
+        (y_true, predictions, class_names, sample_weight, seeds[i],
+         min(CHUNK_SIZE, n_bootstrap - i * CHUNK_SIZE))
+        for i in range(n_chunks)
+    ]
+
+    if n_jobs == 1:
+        chunks = list(map(_bootstrap_chunk, jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            chunks = list(pool.map(_bootstrap_chunk, jobs))
+
+    alpha = (1 - confidence) / 2 * 100
+    intervals = {}
+    for variant in predictions:
+        rows = [row for chunk in chunks for row in chunk[variant]]
+        keys = rows[0].keys()
+        values = np.array([[row[key] for key in keys] for row in rows])
+        low, high = np.nanpercentile(values, [alpha, 100 - alpha], axis=0)
+        intervals[variant] = {
+            key: {'low': float(lo), 'high': float(hi)}
+            for key, lo, hi in zip(keys, low, high)
+        }
+    return intervals
+
+
+def _input_paths(model_path=MODEL_PATH, scaler_path=SCALER_PATH, mapping_path=MAPPING_PATH,
+                 x_test_path=X_TEST_PATH, y_test_path=Y_TEST_PATH, w_test_path=W_TEST_PATH):
+    paths = [model_path, scaler_path, mapping_path, x_test_path, y_test_path]
+    if os.path.exists(w_test_path):
+        paths.append(w_test_path)
+    return paths
+
+
+def _evaluation_code():
+    """Hash of the code the report's numbers come from (metrics, bootstrap, clinical overrides)"""
+    return code_sha256(evaluate)
+
+
+def _cache_key(paths, params, code):
+    """Hash of the model bundle, the test data, the evaluation code and settings"""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(file_sha256(path).encode())
+    digest.update(code.encode())
+    digest.update(json.dumps({**params, 'format': REPORT_FORMAT}, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+def load_report(report_path=REPORT_PATH):
+    """Load a previously written evaluation report, or None if there is none"""
+    if not os.path.exists(report_path):
+        return None
+    with open(report_path) as f:
+        return json.load(f)
+
+
+def is_report_current(report):
+    """Whether a report was computed from the current model bundle, test data and evaluation code"""
+    current = {path: file_sha256(path) for path in _input_paths() if os.path.exists(path)}
+    return report.get('inputs') == current and report.get('code') == _evaluation_code()
+
+
+def load_test_predictions(model_path=MODEL_PATH, scaler_path=SCALER_PATH, mapping_path=MAPPING_PATH,
+                          x_test_path=X_TEST_PATH, y_test_path=Y_TEST_PATH, w_test_path=W_TEST_PATH):
+    """Run the saved model bundle over the whole test set at once
+
+    Test rows are weighted by w_test_path when it exists, and count once otherwise.
+    """
+    with open(model_path, 'rb') as f:
+        model = pickle.load(f)
+    with open(scaler_path, 'rb') as f:
+        scaler = pickle.load(f)
+    with open(mapping_path, 'rb') as f:
+        risk_mapping = pickle.load(f)
+
+    reverse_mapping = {v: k for k, v in risk_mapping.items()}
+    class_names = [reverse_mapping[i] for i in sorted(reverse_mapping)]
+
+    X_test = pd.read_csv(x_test_path)
+    y_test = np.load(y_test_path).astype(int)
+    if os.path.exists(w_test_path):
+        w_test = np.load(w_test_path)
+        if w_test.shape != y_test.shape:
+            raise ValueError(f"{w_test_path} has {w_test.size} weights for {y_test.size} test rows")
+    else:
+        w_test = np.ones(y_test.size, dtype=int)
+
+    # Same pipeline as MaternalHealthPredictor.predict
+    features = X_test.to_numpy(dtype=float)
+    y_proba = model.predict_proba(scaler.transform(features))
+    y_pred = model.classes_[y_proba.argmax(axis=1)].astype(int)
+
+    return model, risk_mapping, class_names, features, y_test, y_pred, y_proba, w_test
+
+
+def evaluate(model_path=MODEL_PATH, scaler_path=SCALER_PATH, mapping_path=MAPPING_PATH,
+             x_test_path=X_TEST_PATH, y_test_path=Y_TEST_PATH, w_test_path=W_TEST_PATH,
+             report_path=REPORT_PATH, n_bootstrap=1000, confidence=0.95, seed=42, n_jobs=None,
+             force=False):
+    """Evaluate the saved model before and after clinical overrides, with a cached report"""
+    params = {'n_bootstrap': n_bootstrap, 'confidence': confidence, 'seed': seed}
+    input_paths = _input_paths(model_path, scaler_path, mapping_path, x_test_path, y_test_path, w_test_path)
+    code = _evaluation_code()
+    cache_key = _cache_key(input_paths, params, code)
+
+    cached = load_report(report_path)
+    if not force and cached is not None and cached.get('cache_key') == cache_key:
+        return cached
+
+    model, risk_mapping, class_names, features, y_test, y_pred, y_proba, w_test = load_test_predictions(
+        model_path, scaler_path, mapping_path, x_test_path, y_test_path, w_test_path)
+    y_adjusted = apply_clinical_overrides(features, y_pred, risk_mapping)
+
+    # Overrides change labels but not the probabilities, so ranking metrics belong to ml_model only
+    predictions = {'ml_model': (y_pred, y_proba), 'with_overrides': (y_adjusted, None)}
+    intervals = bootstrap_intervals(y_test, predictions, class_names, w_test,
+                                    n_bootstrap=n_bootstrap, confidence=confidence,
+                                    seed=seed, n_jobs=n_jobs)
+
+    report = {
+        'cache_key': cache_key,
+        'model': type(model).__name__,
+        'inputs': {path: file_sha256(path) for path in input_paths},
+        'code': code,
+        'n_samples': int(y_test.size),
+        'n_weighted': int(w_test.sum()),
+        **params,
+        'class_names': class_names,
+    }
+    for variant, (y_variant, y_variant_proba) in predictions.items():
+        report[variant] = {
+            'metrics': compute_metrics(y_test, y_variant, y_variant_proba, class_names, w_test),
+            'confidence_intervals': intervals[variant],
+        }
+
+    os.makedirs(os.path.dirname(report_path), exist_ok=True)
+    with open(report_path, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluate the maternal health risk model")
+    parser.add_argument('--bootstrap', type=int, default=1000, help="Number of bootstrap rounds")
+    parser.add_argument('--confidence', type=float, default=0.95, help="Confidence level of the intervals")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--jobs', type=int, default=None, help="Worker processes (default: all CPUs)")
+    parser.add_argument('--force', action='store_true', help="Ignore a cached report")
+    args = parser.parse_args()
+
+    report = evaluate(n_bootstrap=args.bootstrap, confidence=args.confidence,
+                      seed=args.seed, n_jobs=args.jobs, force=args.force)
+
+    print("="*60)
+    print(f"MODEL EVALUATION ({report['model']}, n={report['n_samples']} unique rows, "
+          f"weight {report['n_weighted']})")
+    print("="*60)
+    level = f"{report['confidence']*100:.0f}% CI"
+    for variant, title in [('ml_model', "ML model"), ('with_overrides', "With clinical overrides")]:
+        print(f"\n{title}:")
+        metrics = report[variant]['metrics']
+        intervals = report[variant]['confidence_intervals']
+        for key in ['accuracy', 'precision_weighted', 'recall_weighted', 'f1_weighted', 'roc_auc_weighted']:
+            if key not in metrics:
+                continue
+            ci = intervals[key]
+            print(f"  {key:<20} {metrics[key]:.4f}  ({level} {ci['low']:.4f} - {ci['high']:.4f})")
+    print("="*60)
+    print(f"Report saved to {REPORT_PATH}")
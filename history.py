@@ -0,0 +1,427 @@
+import argparse
+import json
+import sqlite3
+import threading
+from datetime import date
+
+import pandas as pd
+
+from predict import ConfidenceBand, MaternalHealthPredictor
+
+HISTORY_PATH = 'data/patient_history.db'
+
+# visit_date format of batch CSVs unless another one is given; applied to every row
+DATE_FORMAT = '%Y-%m-%d'
+
+# Vitals columns of the visits table, in feature order
+VITALS = ['age', 'systolic_bp', 'diastolic_bp', 'bs', 'body_temp', 'heart_rate']
+
+# Column names of the same features in the dataset / batch CSVs
+FEATURE_COLUMNS = ['Age', 'SystolicBP', 'DiastolicBP', 'BS', 'BodyTemp', 'HeartRate']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS visits (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    patient_id TEXT NOT NULL,
+    visit_date TEXT NOT NULL,
+    age REAL, systolic_bp REAL, diastolic_bp REAL, bs REAL, body_temp REAL, heart_rate REAL,
+    risk_code INTEGER NOT NULL,
+    risk_level TEXT NOT NULL,
+    confidence TEXT NOT NULL,
+    probabilities TEXT NOT NULL,
+    recorded_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS visits_patient_date ON visits (patient_id, visit_date);
+
+CREATE TRIGGER IF NOT EXISTS visits_no_update BEFORE UPDATE ON visits
+BEGIN SELECT RAISE(ABORT, 'visits are append-only'); END;
+CREATE TRIGGER IF NOT EXISTS visits_no_delete BEFORE DELETE ON visits
+BEGIN SELECT RAISE(ABORT, 'visits are append-only'); END;
+
+-- Corrections: a visit listed here was replaced by a later one (or voided if replaced_by is NULL)
+CREATE TABLE IF NOT EXISTS superseded (
+    visit_id INTEGER PRIMARY KEY REFERENCES visits (id),
+    replaced_by INTEGER REFERENCES visits (id),
+    recorded_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TRIGGER IF NOT EXISTS superseded_no_update BEFORE UPDATE ON superseded
+BEGIN SELECT RAISE(ABORT, 'corrections are append-only'); END;
+CREATE TRIGGER IF NOT EXISTS superseded_no_delete BEFORE DELETE ON superseded
+BEGIN SELECT RAISE(ABORT, 'corrections are append-only'); END;
+
+CREATE VIEW IF NOT EXISTS current_visits AS
+SELECT * FROM visits WHERE id NOT IN (SELECT visit_id FROM superseded);
+
+CREATE TABLE IF NOT EXISTS patient_trends (
+    patient_id TEXT PRIMARY KEY,
+    n_visits INTEGER NOT NULL,
+    first_visit TEXT NOT NULL,
+    last_visit TEXT NOT NULL,
+    last_systolic REAL, last_diastolic REAL,
+    sum_t REAL, sum_tt REAL,
+    sum_sys REAL, sum_t_sys REAL,
+    sum_dia REAL, sum_t_dia REAL,
+    last_risk_code INTEGER, last_risk_level TEXT,
+    max_risk_code INTEGER, max_risk_level TEXT,
+    transition_date TEXT, transition_from TEXT, transition_to TEXT
+);
+"""
+
+TREND_COLUMNS = [
+    'patient_id', 'n_visits', 'first_visit', 'last_visit', 'last_systolic', 'last_diastolic',
+    'sum_t', 'sum_tt', 'sum_sys', 'sum_t_sys', 'sum_dia', 'sum_t_dia',
+    'last_risk_code', 'last_risk_level', 'max_risk_code', 'max_risk_level',
+    'transition_date', 'transition_from', 'transition_to',
+]
+
+
+def _new_aggregate(patient_id, first_visit):
+    agg = dict.fromkeys(TREND_COLUMNS)
+    agg.update(patient_id=patient_id, n_visits=0, first_visit=first_visit,
+               sum_t=0.0, sum_tt=0.0, sum_sys=0.0, sum_t_sys=0.0, sum_dia=0.0, sum_t_dia=0.0)
+    return agg
+
+
+def _fold(agg, visit):
+    """Add one visit (not older than agg['last_visit']) to a patient's rolling aggregate"""
+    t = (date.fromisoformat(visit['visit_date']) - date.fromisoformat(agg['first_visit'])).days
+    systolic, diastolic = visit['systolic_bp'], visit['diastolic_bp']
+
+    agg['n_visits'] += 1
+    agg['sum_t'] += t
+    agg['sum_tt'] += t * t
+    agg['sum_sys'] += systolic
+    agg['sum_t_sys'] += t * systolic
+    agg['sum_dia'] += diastolic
+    agg['sum_t_dia'] += t * diastolic
+
+    if agg['last_risk_level'] is not None and agg['last_risk_level'] != visit['risk_level']:
+        agg['transition_date'] = visit['visit_date']
+        agg['transition_from'] = agg['last_risk_level']
+        agg['transition_to'] = visit['risk_level']
+    if agg['max_risk_code'] is None or visit['risk_code'] > agg['max_risk_code']:
+        agg['max_risk_code'] = visit['risk_code']
+        agg['max_risk_level'] = visit['risk_level']
+
+    agg['last_visit'] = visit['visit_date']
+    agg['last_systolic'] = systolic
+    agg['last_diastolic'] = diastolic
+    agg['last_risk_code'] = visit['risk_code']
+    agg['last_risk_level'] = visit['risk_level']
+
+
+def _slope(n, sum_t, sum_tt, sum_y, sum_ty):
+    """Least-squares slope of y over t from running sums, or None if undefined"""
+    den = n * sum_tt - sum_t ** 2
+    if n < 2 or den <= 0:
+        return None
+    return (n * sum_ty - sum_t * sum_y) / den
+
+
+class PatientHistory:
+    """Append-only store of patient visits with incrementally maintained risk trends
+
+    A patient has at most one current visit per date: saving the same visit again
+    is a no-op, and saving different values for that date replaces the earlier
+    visit. Replaced and voided visits stay in the visits table but are left out
+    of visits() and of the trends.
+    """
+
+    def __init__(self, path=HISTORY_PATH):
+        # Shared across Streamlit sessions (threads), so serialize access ourselves
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.lock = threading.Lock()
+        with self.lock, self.conn:
+            self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def _load_aggregate(self, patient_id):
+        row = self.conn.execute('SELECT * FROM patient_trends WHERE patient_id = ?', (patient_id,)).fetchone()
+        return dict(row) if row is not None else None
+
+    def _rebuild_aggregate(self, patient_id):
+        """Recompute a patient's aggregate from the current visits (for backdated visits and corrections)
+
+        Returns None if the patient has no current visits left.
+        """
+        rows = self.conn.execute(
+            'SELECT * FROM current_visits WHERE patient_id = ? ORDER BY visit_date, id', (patient_id,)
+        ).fetchall()
+        if not rows:
+            return None
+        agg = _new_aggregate(patient_id, rows[0]['visit_date'])
+        for row in rows:
+            _fold(agg, dict(row))
+        return agg
+
+    def _save_aggregate(self, patient_id, agg):
+        if agg is None:
+            self.conn.execute('DELETE FROM patient_trends WHERE patient_id = ?', (patient_id,))
+        else:
+            self.conn.execute(
+                f"INSERT OR REPLACE INTO patient_trends ({', '.join(TREND_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(TREND_COLUMNS))})",
+                [agg[col] for col in TREND_COLUMNS]
+            )
+
+    def _supersede(self, visit_id, replaced_by):
+        self.conn.execute('INSERT INTO superseded (visit_id, replaced_by) VALUES (?, ?)',
+                          (visit_id, replaced_by))
+
+    def _current_visit(self, visit_id):
+        row = self.conn.execute('SELECT * FROM current_visits WHERE id = ?', (visit_id,)).fetchone()
+        if row is None:
+            raise ValueError(f"Visit {visit_id} does not exist or was already replaced")
+        return row
+
+    def _record(self, patient_id, visit_date, vitals, risk_code, risk_level, confidence, probabilities,
+                replaces=None):
+        """Insert one visit; returns (visit_id, 'added' | 'replaced' | 'unchanged')"""
+        visit = {
+            'patient_id': str(patient_id),
+            'visit_date': date.fromisoformat(str(visit_date)[:10]).isoformat(),
+            **dict(zip(VITALS, map(float, vitals))),
+            'risk_code': int(risk_code),
+            'risk_level': risk_level,
+            'confidence': confidence,
+            'probabilities': json.dumps(probabilities),
+        }
+
+        same_date = self.conn.execute(
+            'SELECT * FROM current_visits WHERE patient_id = ? AND visit_date = ?',
+            (visit['patient_id'], visit['visit_date'])
+        ).fetchone()
+        if same_date is not None and all(same_date[col] == value for col, value in visit.items()):
+            if replaces is not None and replaces != same_date['id']:
+                self._supersede(replaces, same_date['id'])
+                self._save_aggregate(visit['patient_id'], self._rebuild_aggregate(visit['patient_id']))
+                return same_date['id'], 'replaced'
+            return same_date['id'], 'unchanged'
+
+        visit_id = self.conn.execute(
+            f"INSERT INTO visits ({', '.join(visit)}) VALUES ({', '.join('?' * len(visit))})",
+            list(visit.values())
+        ).lastrowid
+
+        replaced = {replaces} if replaces is not None else set()
+        if same_date is not None:
+            replaced.add(same_date['id'])
+        for old_id in replaced:
+            self._supersede(old_id, visit_id)
+
+        agg = self._load_aggregate(visit['patient_id'])
+        if replaced:
+            agg = self._rebuild_aggregate(visit['patient_id'])
+        elif agg is None:
+            agg = _new_aggregate(visit['patient_id'], visit['visit_date'])
+            _fold(agg, visit)
+        elif visit['visit_date'] >= agg['last_visit']:
+            _fold(agg, visit)
+        else:
+            agg = self._rebuild_aggregate(visit['patient_id'])
+        self._save_aggregate(visit['patient_id'], agg)
+
+        return visit_id, 'replaced' if replaced else 'added'
+
+    def record_visit(self, patient_id, visit_date, vitals, result):
+        """Store one visit: vitals in feature order and its PredictionResult
+
+        Returns (visit_id, status), status being 'added', 'replaced' (another visit
+        of that patient on that date was replaced) or 'unchanged' (already saved).
+        """
+        probabilities = dict(zip(result.class_names, map(float, result.probabilities)))
+        with self.lock, self.conn:
+            return self._record(patient_id, visit_date, vitals, result.risk_code, result.risk_level,
+                                result.confidence.label, probabilities)
+
+    def record_batch(self, patient_ids, visit_dates, features, batch):
+        """Store many visits and their BatchPredictionResult in one transaction
+
+        Returns the status of every row, as for record_visit.
+        """
+        levels = batch.risk_levels
+        confidences = [ConfidenceBand(int(code)).label for code in batch.confidence_codes]
+        statuses = []
+        with self.lock, self.conn:
+            for i, (patient_id, visit_date) in enumerate(zip(patient_ids, visit_dates)):
+                probabilities = dict(zip(batch.class_names, map(float, batch.probabilities[i])))
+                _, status = self._record(patient_id, visit_date, features[i], batch.risk_codes[i], levels[i],
+                                         confidences[i], probabilities)
+                statuses.append(status)
+        return statuses
+
+    def amend_visit(self, visit_id, visit_date, vitals, result):
+        """Replace a wrongly recorded visit (e.g. wrong date or vitals) with a corrected one"""
+        with self.lock, self.conn:
+            old = self._current_visit(visit_id)
+            probabilities = dict(zip(result.class_names, map(float, result.probabilities)))
+            return self._record(old['patient_id'], visit_date, vitals, result.risk_code, result.risk_level,
+                                result.confidence.label, probabilities, replaces=visit_id)
+
+    def void_visit(self, visit_id):
+        """Withdraw a visit recorded in error (it is kept, but no longer counts)"""
+        with self.lock, self.conn:
+            patient_id = self._current_visit(visit_id)['patient_id']
+            self._supersede(visit_id, None)
+            self._save_aggregate(patient_id, self._rebuild_aggregate(patient_id))
+
+    def visits(self, patient_id, include_superseded=False):
+        """Visit history of one patient, oldest first
+
+        With include_superseded, replaced and voided visits are listed too, with
+        the id of the visit that replaced them (NULL when voided) in 'replaced_by'.
+        """
+        if include_superseded:
+            query = ('SELECT visits.*, superseded.visit_id IS NOT NULL AS superseded, superseded.replaced_by '
+                     'FROM visits LEFT JOIN superseded ON superseded.visit_id = visits.id '
+                     'WHERE patient_id = ? ORDER BY visit_date, id')
+        else:
+            query = 'SELECT * FROM current_visits WHERE patient_id = ? ORDER BY visit_date, id'
+        with self.lock:
+            return pd.read_sql_query(query, self.conn, params=(patient_id,))
+
+    def trend(self, patient_id):
+        """Risk trend summary read from the patient's aggregate row (constant time)"""
+        with self.lock:
+            agg = self._load_aggregate(patient_id)
+        if agg is None:
+            return None
+
+        sums = agg['n_visits'], agg['sum_t'], agg['sum_tt']
+        systolic = _slope(*sums, agg['sum_sys'], agg['sum_t_sys'])
+        diastolic = _slope(*sums, agg['sum_dia'], agg['sum_t_dia'])
+
+        return {
+            'patient_id': agg['patient_id'],
+            'n_visits': agg['n_visits'],
+            'first_visit': agg['first_visit'],
+            'last_visit': agg['last_visit'],
+            'last_risk_level': agg['last_risk_level'],
+            'max_risk_level': agg['max_risk_level'],
+            'last_systolic': agg['last_systolic'],
+            'last_diastolic': agg['last_diastolic'],
+            # mmHg per week
+            'systolic_trend': systolic * 7 if systolic is not None else None,
+            'diastolic_trend': diastolic * 7 if diastolic is not None else None,
+            'last_transition': {
+                'date': agg['transition_date'],
+                'from': agg['transition_from'],
+                'to': agg['transition_to'],
+            } if agg['transition_date'] else None,
+        }
+
+
+def _reject_rows(csv_path, df, invalid, column, problem):
+    """Raise ValueError listing the CSV lines flagged in invalid"""
+    if invalid.any():
+        # CSV line numbers: 1-based, after the header
+        rows = ', '.join(f"line {i + 2} ({df.at[i, column]!r})" for i in df.index[invalid])
+        raise ValueError(f"{problem} in {csv_path}: {rows}")
+
+
+def score_csv(csv_path, history_path=HISTORY_PATH, predictor=None, date_format=DATE_FORMAT):
+    """Batch-score a CSV of visits (patient_id, visit_date + feature columns) into the history
+
+    Patient IDs are kept as written (e.g. 007), stripped like the app's input.
+    Every visit_date must match date_format (a strptime format). A file with a
+    blank patient_id or any other date is rejected before anything is stored.
+    """
+    if predictor is None:
+        predictor = MaternalHealthPredictor()
+
+    # Raw text: no numeric conversion ('007' -> 7) or NA detection ('' -> nan)
+    df = pd.read_csv(csv_path, converters={'patient_id': str, 'visit_date': str})
+    df['patient_id'] = df['patient_id'].str.strip()
+    _reject_rows(csv_path, df, df['patient_id'] == '', 'patient_id', "Blank patient_id")
+
+    # One format for the whole file: guessing per row would misread day-first dates as month-first
+    dates = pd.to_datetime(df['visit_date'], format=date_format, errors='coerce')
+    _reject_rows(csv_path, df, dates.isna(), 'visit_date', f"visit_date not in {date_format} format")
+
+    # Oldest visits first, so aggregates are updated incrementally rather than rebuilt
+    df = (df.assign(visit_date=dates.dt.date)
+          .sort_values('visit_date', kind='mergesort').reset_index(drop=True))
+    features = df[FEATURE_COLUMNS].to_numpy(dtype=float)
+    batch = predictor.predict_batch(features)
+
+    history = PatientHistory(history_path)
+    try:
+        statuses = history.record_batch(df['patient_id'], df['visit_date'], features, batch)
+    finally:
+        history.close()
+
+    return df.assign(risk_level=batch.risk_levels, status=statuses)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Patient visit history and risk trends")
+    parser.add_argument('--db', default=HISTORY_PATH, help="History database file")
+    commands = parser.add_subparsers(dest='command', required=True)
+    score = commands.add_parser('score', help="Batch-score a CSV of visits into the history")
+    score.add_argument('csv', help="CSV with patient_id, visit_date and " + ", ".join(FEATURE_COLUMNS))
+    score.add_argument('--date-format', default=DATE_FORMAT,
+                       help="strptime format of every visit_date (default: %(default)s)")
+    show = commands.add_parser('trend', help="Show a patient's risk trend")
+    show.add_argument('patient_id')
+    listing = commands.add_parser('visits', help="List a patient's visits and their ids")
+    listing.add_argument('patient_id')
+    listing.add_argument('--all', action='store_true', help="Include replaced and voided visits")
+    amend = commands.add_parser('amend', help="Replace a wrongly recorded visit with corrected values")
+    amend.add_argument('visit_id', type=int)
+    amend.add_argument('visit_date', help="Corrected visit date (YYYY-MM-DD)")
+    amend.add_argument('vitals', nargs=len(VITALS), type=float, metavar='VITAL',
+                       help="Corrected " + ", ".join(VITALS))
+    void = commands.add_parser('void', help="Withdraw a visit recorded in error")
+    void.add_argument('visit_id', type=int)
+    args = parser.parse_args()
+
+    if args.command == 'score':
+        try:
+            scored = score_csv(args.csv, args.db, date_format=args.date_format)
+        except ValueError as e:
+            parser.error(str(e))
+        counts = scored['status'].value_counts()
+        print(f"Scored {len(scored)} visits: {counts.get('added', 0)} added, "
+              f"{counts.get('replaced', 0)} replaced, {counts.get('unchanged', 0)} already stored")
+        print(scored['risk_level'].value_counts().to_string())
+    elif args.command == 'visits':
+        history = PatientHistory(args.db)
+        visits = history.visits(args.patient_id, include_superseded=args.all)
+        history.close()
+        print(visits.drop(columns=['patient_id', 'probabilities']).to_string(index=False))
+    elif args.command == 'amend':
+        history = PatientHistory(args.db)
+        result = MaternalHealthPredictor().predict_result(*args.vitals)
+        visit_id, _ = history.amend_visit(args.visit_id, args.visit_date, args.vitals, result)
+        history.close()
+        print(f"Visit {args.visit_id} replaced by visit {visit_id} ({result.risk_level})")
+    elif args.command == 'void':
+        history = PatientHistory(args.db)
+        history.void_visit(args.visit_id)
+        history.close()
+        print(f"Visit {args.visit_id} voided")
+    else:
+        history = PatientHistory(args.db)
+        trend = history.trend(args.patient_id)
+        history.close()
+
+        if trend is None:
+            print(f"No visits recorded for patient {args.patient_id}")
+        else:
+            print("="*60)
+            print(f"PATIENT {trend['patient_id']} ({trend['n_visits']} visit(s), "
+                  f"{trend['first_visit']} to {trend['last_visit']})")
+            print("="*60)
+            print(f"Current risk: {trend['last_risk_level'].upper()} "
+                  f"(highest: {trend['max_risk_level']})")
+            print(f"Last BP: {trend['last_systolic']:.0f}/{trend['last_diastolic']:.0f} mmHg")
+            if trend['systolic_trend'] is not None:
+                print(f"BP trend: {trend['systolic_trend']:+.1f}/{trend['diastolic_trend']:+.1f} mmHg per week")
+            if trend['last_transition']:
+                change = trend['last_transition']
+                print(f"Last risk change: {change['from']} → {change['to']} on {change['date']}")
+            print("="*60)
@@ -0,0 +1,212 @@
+import argparse
+import json
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import numpy as np
+import pandas as pd
+
+DATASET_PATH = 'data/raw_data/maternal_health_clean.csv'
+
+# Keyword names of MaternalHealthPredictor.predict, in feature order
+FIELDS = ['age', 'systolic_bp', 'diastolic_bp', 'bs', 'body_temp', 'heart_rate']
+
+# Labels of the matching app.py text inputs, in feature order
+APP_LABELS = [
+    "Age (years)",
+    "Systolic Blood Pressure (mmHg)",
+    "Diastolic Blood Pressure (mmHg)",
+    "Blood Sugar Level (mmol/L)",
+    "Body Temperature (°F)",
+    "Heart Rate (bpm)",
+]
+
+
+class VitalsSampler:
+    """Synthetic patient vitals drawn from the joint distribution of the dataset
+
+    Whole rows are resampled (keeping the correlations between vitals), then
+    jittered by a fraction of each feature's std, clipped to the observed range
+    and rounded to the dataset's precision.
+    """
+
+    def __init__(self, dataset_path=DATASET_PATH, jitter=0.05, seed=None):
+        df = pd.read_csv(dataset_path).drop(columns='RiskLevel')
+        self.data = df.to_numpy(dtype=float)
+        self.scale = self.data.std(axis=0) * jitter
+        self.low = self.data.min(axis=0)
+        self.high = self.data.max(axis=0)
+        self.integer = np.all(self.data == np.round(self.data), axis=0)
+        self.rng = np.random.default_rng(seed)
+
+    def sample(self, n):
+        rows = self.data[self.rng.integers(0, len(self.data), n)]
+        rows = np.clip(rows + self.rng.normal(0, self.scale, rows.shape), self.low, self.high)
+        return np.where(self.integer, np.round(rows), np.round(rows, 1))
+
+
+def in_process_target(predictor=None):
+    """Call MaternalHealthPredictor.predict directly"""
+    if predictor is None:
+        from predict import MaternalHealthPredictor
+        predictor = MaternalHealthPredictor()
+
+    def call(vitals):
+        predictor.predict(*vitals)
+    return call
+
+
+def http_target(url, method='POST', timeout=10):
+    """POST the vitals as JSON to a local endpoint (or GET it, e.g. Streamlit's /_stcore/health)"""
+    def call(vitals):
+        if method == 'GET':
+            request = Request(url)
+        else:
+            body = json.dumps(dict(zip(FIELDS, map(float, vitals)))).encode()
+            request = Request(url, data=body, headers={'Content-Type': 'application/json'}, method=method)
+        with urlopen(request, timeout=timeout) as response:
+            response.read()
+    return call
+
+
+def app_target(app_path='app.py', timeout=30):
+    """Run app.py itself: a new session loads the page, enters the vitals and clicks Predict
+
+    Uses streamlit.testing.v1.AppTest, so every call pays for two full script reruns
+    (page load + Predict), as a browser session would, but not for the websocket
+    and browser rendering. Sessions share the process's cached predictor, like a server.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    def call(vitals):
+        at = AppTest.from_file(app_path, default_timeout=timeout).run()
+        inputs = {text_input.label: text_input for text_input in at.text_input}
+        for label, value in zip(APP_LABELS, vitals):
+            inputs[label].input(f"{value:g}")
+        next(button for button in at.button if button.label == "Predict Risk Level").click()
+        at.run()
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+        if at.error:
+            raise RuntimeError(' '.join(error.value for error in at.error))
+    return call
+
+
+def _error_kind(error):
+    """Grouping key of a failed request: HTTP status or exception type"""
+    if isinstance(error, HTTPError):
+        return f"HTTP {error.code}"
+    return type(error).__name__
+
+
+def run_load(target, rate, concurrency, duration, sampler, seed=None):
+    """Open-loop run: Poisson arrivals at `rate`/s served by `concurrency` workers
+
+    Latency is measured from each request's scheduled arrival, so time spent
+    queueing for a free worker counts against the deployment.
+    """
+    rng = np.random.default_rng(seed)
+    n = max(1, int(rate * duration))
+    arrivals = np.cumsum(rng.exponential(1 / rate, n))
+    vitals = sampler.sample(n)
+
+    latencies = np.full(n, np.nan)
+    errors = np.zeros(n, dtype=bool)
+    failures = [None] * n
+
+    def send(i):
+        try:
+            target(vitals[i])
+        except Exception as e:
+            errors[i] = True
+            failures[i] = (_error_kind(e), str(e))
+        latencies[i] = time.perf_counter() - (start + arrivals[i])
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        start = time.perf_counter()
+        for i, arrival in enumerate(arrivals):
+            delay = start + arrival - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(send, i)
+    elapsed = time.perf_counter() - start
+
+    ok = latencies[~errors]
+    samples = {}
+    for kind, message in filter(None, failures):
+        samples.setdefault(kind, message)
+    error_counts = Counter(kind for kind, _ in filter(None, failures))
+    p50, p90, p99 = np.percentile(ok, [50, 90, 99]) if ok.size else (np.nan,) * 3
+    return {
+        'concurrency': concurrency,
+        'offered_rate': rate,
+        'requests': n,
+        'throughput': ok.size / elapsed,
+        'p50_ms': p50 * 1000,
+        'p90_ms': p90 * 1000,
+        'p99_ms': p99 * 1000,
+        'max_ms': ok.max() * 1000 if ok.size else np.nan,
+        'error_rate': errors.mean(),
+        # {kind: (count, sample message)}
+        'errors': {kind: (count, samples[kind]) for kind, count in error_counts.most_common()},
+    }
+
+
+def sweep(target, rates, concurrencies, duration, sampler, seed=42):
+    """run_load for every (rate, concurrency) pair"""
+    results = []
+    for rate in rates:
+        for concurrency in concurrencies:
+            result = run_load(target, rate, concurrency, duration, sampler, seed=seed)
+            errors = result.pop('errors')
+            results.append(result)
+            print(f"rate={rate:>7.1f}/s  concurrency={concurrency:>3}  "
+                  f"throughput={result['throughput']:>7.1f}/s  "
+                  f"p50={result['p50_ms']:>8.1f}ms  p99={result['p99_ms']:>8.1f}ms  "
+                  f"errors={result['error_rate']*100:.1f}%")
+            for kind, (count, sample) in errors.items():
+                print(f"    {count} x {kind}: {sample}")
+    return pd.DataFrame(results)
+
+
+def _number_list(text, cast):
+    return [cast(value) for value in text.split(',')]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate concurrent clinic traffic against the predictor")
+    parser.add_argument('--url', help="Local endpoint to load (default: call the predictor in-process)")
+    parser.add_argument('--app', action='store_true',
+                        help="Run app.py sessions in-process (page load + Predict) instead of the bare predictor")
+    parser.add_argument('--method', default='POST', choices=['POST', 'GET'])
+    parser.add_argument('--rate', default='10,50,100', help="Comma-separated arrival rates (requests/s)")
+    parser.add_argument('--concurrency', default='1,2,4,8,16', help="Comma-separated worker counts")
+    parser.add_argument('--duration', type=float, default=10, help="Seconds of traffic per run")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help="Write the results table to this CSV file")
+    args = parser.parse_args()
+
+    if args.url:
+        target, label = http_target(args.url, args.method), args.url
+    elif args.app:
+        target, label = app_target(), "app.py sessions"
+    else:
+        target, label = in_process_target(), "in-process predictor"
+    sampler = VitalsSampler(seed=args.seed)
+
+    print("="*60)
+    print(f"LOAD TEST ({label})")
+    if not args.url and not args.app:
+        print("Predictor only: excludes Streamlit's per-rerun cost of app.py (see --app)")
+    print("="*60)
+    results = sweep(target, _number_list(args.rate, float), _number_list(args.concurrency, int),
+                    args.duration, sampler, seed=args.seed)
+
+    print("="*60)
+    print(results.round(2).to_string(index=False))
+    if args.output:
+        results.to_csv(args.output, index=False)
+        print(f"\nResults saved to {args.output}")
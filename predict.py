@@ -1,5 +1,134 @@
 import pickle
+from enum import IntEnum
+
 import numpy as np
+import pandas as pd
+
+
+def apply_clinical_overrides(features, predictions, risk_mapping):
+    """Apply doctor rules to encoded ML predictions (one row per patient)"""
+    age, systolic_bp, diastolic_bp, bs, body_temp, heart_rate = np.asarray(features, dtype=float).T
+    adjusted = np.array(predictions, copy=True)
+
+    # 🚨 ABSOLUTE HIGH-RISK OVERRIDES (DOCTOR RULES)
+    # Once HIGH RISK → ALWAYS HIGH RISK
+    high = (
+        (systolic_bp >= 140) |
+        (diastolic_bp >= 90) |
+        (bs >= 11.1) |
+        (body_temp >= 100.4) |
+        (heart_rate >= 110) |
+        (age < 18) | (age > 35)
+    )
+
+    # ⚠️ BORDERLINE CONDITIONS → MID RISK (only if not already high)
+    borderline = (
+        (systolic_bp >= 120) |
+        (diastolic_bp >= 80) |
+        (bs >= 7.0) |
+        (body_temp >= 99.0) |
+        (heart_rate >= 90)
+    )
+
+    adjusted[borderline & (adjusted == risk_mapping['low risk'])] = risk_mapping['mid risk']
+    adjusted[high] = risk_mapping['high risk']
+    return adjusted
+
+
+class ConfidenceBand(IntEnum):
+    """Confidence range of the ML prediction"""
+    VERY_LOW = 0
+    LOW = 1
+    MODERATE = 2
+    HIGH = 3
+    VERY_HIGH = 4
+
+    @property
+    def label(self):
+        return _CONFIDENCE_LABELS[self]
+
+    def __str__(self):
+        return self.label
+
+    @classmethod
+    def codes(cls, probs):
+        """Band codes for an array of probabilities (0-1)"""
+        return np.searchsorted(_CONFIDENCE_THRESHOLDS, np.asarray(probs) * 100, side='right').astype(np.int8)
+
+    @classmethod
+    def from_probability(cls, prob):
+        return cls(int(cls.codes(prob)))
+
+
+# Lower bound (in %) of every band above VERY_LOW
+_CONFIDENCE_THRESHOLDS = np.array([55, 70, 80, 95])
+_CONFIDENCE_LABELS = ["50-55%", "55-70%", "70-80%", "80-90%", "95-98%"]
+
+
+class PredictionResult:
+    """Prediction for one patient; strings are only built by to_dict()"""
+    __slots__ = ('risk_code', 'confidence', 'probabilities', 'class_names')
+
+    def __init__(self, risk_code, confidence, probabilities, class_names):
+        self.risk_code = risk_code
+        self.confidence = confidence
+        self.probabilities = probabilities
+        self.class_names = class_names
+
+    @property
+    def risk_level(self):
+        return self.class_names[self.risk_code]
+
+    def to_dict(self):
+        """Legacy output of MaternalHealthPredictor.predict"""
+        return {
+            'risk_level': self.risk_level,
+            'confidence': self.confidence.label,
+            'probabilities': {
+                name: f"{prob*100:.2f}%"
+                for name, prob in zip(self.class_names, self.probabilities)
+            }
+        }
+
+
+class BatchPredictionResult:
+    """Predictions for many patients, stored as one array per field"""
+    __slots__ = ('risk_codes', 'confidence_codes', 'probabilities', 'class_names')
+
+    def __init__(self, risk_codes, confidence_codes, probabilities, class_names):
+        self.risk_codes = risk_codes
+        self.confidence_codes = confidence_codes
+        self.probabilities = probabilities
+        self.class_names = class_names
+
+    def __len__(self):
+        return len(self.risk_codes)
+
+    def __getitem__(self, i):
+        return PredictionResult(int(self.risk_codes[i]), ConfidenceBand(int(self.confidence_codes[i])),
+                                self.probabilities[i], self.class_names)
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    @property
+    def risk_levels(self):
+        return np.asarray(self.class_names)[self.risk_codes]
+
+    def to_dicts(self):
+        """Legacy dict output, one per patient"""
+        return [result.to_dict() for result in self]
+
+    def to_frame(self):
+        """Display/export table with risk level, confidence label and % probabilities"""
+        frame = pd.DataFrame({
+            'risk_level': self.risk_levels,
+            'confidence': np.asarray(_CONFIDENCE_LABELS)[self.confidence_codes],
+        })
+        for k, name in enumerate(self.class_names):
+            frame[name] = (self.probabilities[:, k] * 100).round(2)
+        return frame
+
 
 class MaternalHealthPredictor:
     """Maternal Health Risk Predictor"""
@@ -20,69 +149,40 @@ class MaternalHealthPredictor:
 
     def _confidence_range(self, prob):
         """Convert probability to confidence range"""
-        prob = prob * 100
-
-        if prob >= 95:
-            return "95-98%"
-        elif prob >= 80:
-            return "80-90%"
-        elif prob >= 70:
-            return "70-80%"
-        elif prob >= 55:
-            return "55-70%"
-        else:
-            return "50-55%"
+        return ConfidenceBand.from_probability(prob).label
 
-    def predict(self, age, systolic_bp, diastolic_bp, bs, body_temp, heart_rate):
-        """Predict maternal health risk"""
+    def predict_batch(self, features):
+        """Predict maternal health risk for many patients at once
 
-        # Create feature array
-        features = np.array([[age, systolic_bp, diastolic_bp, bs, body_temp, heart_rate]])
+        features: rows of (age, systolic_bp, diastolic_bp, bs, body_temp, heart_rate)
+        """
+        features = np.asarray(features, dtype=float)
+        if features.ndim != 2 or features.shape[1] != 6:
+            raise ValueError(f"Expected one row of 6 features per patient, got shape {features.shape}")
 
         # Scale
         features_scaled = self.scaler.transform(features)
 
         # Predict (ML output)
-        prediction = self.model.predict(features_scaled)[0]
-        probabilities = self.model.predict_proba(features_scaled)[0]
-
-        # Decode ML prediction
-        risk_level = self.reverse_mapping[prediction]
-
-        # 🚨 ABSOLUTE HIGH-RISK OVERRIDES (DOCTOR RULES)
-        # Once HIGH RISK → ALWAYS HIGH RISK
-        if (
-            systolic_bp >= 140 or
-            diastolic_bp >= 90 or
-            bs >= 11.1 or
-            body_temp >= 100.4 or
-            heart_rate >= 110 or
-            age < 18 or age > 35
-        ):
-            risk_level = "high risk"
-
-        # ⚠️ BORDERLINE CONDITIONS → MID RISK (only if not already high)
-        elif (
-            systolic_bp >= 120 or
-            diastolic_bp >= 80 or
-            bs >= 7.0 or
-            body_temp >= 99.0 or
-            heart_rate >= 90
-        ):
-            if risk_level == "low risk":
-                risk_level = "mid risk"
+        probabilities = self.model.predict_proba(features_scaled)
+        best = probabilities.argmax(axis=1)
+        predictions = self.model.classes_[best]
+
+        # Apply doctor rules to the ML prediction
+        risk_codes = apply_clinical_overrides(features, predictions, self.risk_mapping)
 
         # Confidence range (based on ML probability)
-        confidence = self._confidence_range(probabilities[prediction])
+        confidence_codes = ConfidenceBand.codes(probabilities[np.arange(len(best)), best])
 
-        return {
-            'risk_level': risk_level,
-            'confidence': confidence,
-            'probabilities': {
-                name: f"{prob*100:.2f}%"
-                for name, prob in zip(self.class_names, probabilities)
-            }
-        }
+        return BatchPredictionResult(risk_codes, confidence_codes, probabilities, self.class_names)
+
+    def predict_result(self, age, systolic_bp, diastolic_bp, bs, body_temp, heart_rate):
+        """Predict maternal health risk as a PredictionResult"""
+        return self.predict_batch([[age, systolic_bp, diastolic_bp, bs, body_temp, heart_rate]])[0]
+
+    def predict(self, age, systolic_bp, diastolic_bp, bs, body_temp, heart_rate):
+        """Predict maternal health risk"""
+        return self.predict_result(age, systolic_bp, diastolic_bp, bs, body_temp, heart_rate).to_dict()
 
 
 # Example usage
@@ -0,0 +1,210 @@
+import argparse
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import StratifiedGroupKFold
+from sklearn.preprocessing import StandardScaler
+
+DATASET_PATH = 'data/raw_data/maternal_health_clean.csv'
+MODELS_DIR = 'models'
+PROCESSED_DIR = 'data/processed_data'
+TARGET = 'RiskLevel'
+
+RISK_MAPPING = {
+    'low risk': 0,
+    'mid risk': 1,
+    'high risk': 2
+}
+
+# Same candidates as notebooks/model_retraining.ipynb
+MODELS = {
+    'Random Forest (Balanced)': RandomForestClassifier(
+        n_estimators=300,
+        max_depth=15,
+        min_samples_split=5,
+        min_samples_leaf=2,
+        class_weight='balanced',
+        random_state=42,
+        n_jobs=-1
+    ),
+    'Random Forest (Default)': RandomForestClassifier(
+        n_estimators=200,
+        max_depth=10,
+        random_state=42
+    ),
+    'Random Forest (Deep)': RandomForestClassifier(
+        n_estimators=500,
+        max_depth=20,
+        min_samples_split=3,
+        class_weight='balanced',
+        random_state=42,
+        n_jobs=-1
+    )
+}
+
+
+def deduplicate(df, target=TARGET):
+    """Collapse identical (features, label) rows into unique rows with an integer sample_weight
+
+    Returns the unique rows and the subset of them whose features also appear with another label.
+    """
+    feature_cols = [col for col in df.columns if col != target]
+    unique = (
+        df.groupby(feature_cols + [target], sort=False)
+        .size()
+        .rename('sample_weight')
+        .reset_index()
+    )
+
+    labels_per_features = unique.groupby(feature_cols, sort=False)[target].transform('nunique')
+    conflicts = unique[labels_per_features > 1].sort_values(feature_cols)
+
+    return unique, conflicts
+
+
+def split(X, y, groups, test_size=0.2, random_state=42):
+    """Stratified train/test split that keeps every feature vector on one side"""
+    splitter = StratifiedGroupKFold(n_splits=round(1 / test_size), shuffle=True, random_state=random_state)
+    return next(splitter.split(X, y, groups))
+
+
+def balanced_sample_weight(y, sample_weight):
+    """sample_weight rescaled so that every class carries the same total weight"""
+    classes, inverse = np.unique(y, return_inverse=True)
+    totals = np.bincount(inverse, weights=sample_weight)
+    return sample_weight * (sample_weight.sum() / (len(classes) * totals))[inverse]
+
+
+def fit_weighted(model, X, y, sample_weight):
+    """Fit a copy of model with sample weights
+
+    sklearn derives class_weight='balanced' from the label counts of the rows it is
+    given, which ignores the duplicate counts in sample_weight. Such models are fit
+    without class_weight, and balanced weights computed from the weighted class
+    totals are folded into sample_weight instead.
+    """
+    model = clone(model)
+    if model.get_params().get('class_weight') == 'balanced':
+        model.set_params(class_weight=None)
+        sample_weight = balanced_sample_weight(y, sample_weight)
+    return model.fit(X, y, sample_weight=sample_weight)
+
+
+def weighted_cross_val_score(model, X, y, sample_weight, groups, cv=5, random_state=42):
+    """cross_val_score with sample weights in both fitting and scoring"""
+    folds = StratifiedGroupKFold(n_splits=cv, shuffle=True, random_state=random_state)
+    scores = []
+    for train_idx, val_idx in folds.split(X, y, groups):
+        fold_model = fit_weighted(model, X[train_idx], y[train_idx], sample_weight[train_idx])
+        scores.append(accuracy_score(y[val_idx], fold_model.predict(X[val_idx]),
+                                     sample_weight=sample_weight[val_idx]))
+    return np.array(scores)
+
+
+def train(dataset_path=DATASET_PATH, dedupe=True, save=False):
+    """Train the candidate models and keep the best one by (weighted) test accuracy"""
+    df = pd.read_csv(dataset_path)
+    feature_columns = [col for col in df.columns if col != TARGET]
+
+    print("="*70)
+    print("PREPROCESSING")
+    print("="*70)
+    print(f"Dataset: {df.shape[0]} rows")
+
+    if dedupe:
+        data, conflicts = deduplicate(df)
+        print(f"Unique (features, label) rows: {len(data)} "
+              f"({len(df) - len(data)} duplicates folded into sample_weight)")
+        if len(conflicts):
+            print(f"\n⚠️ {len(conflicts)} unique rows share features with a different label:")
+            print(conflicts.to_string(index=False))
+    else:
+        data = df.assign(sample_weight=1)
+
+    X = data[feature_columns]
+    y = data[TARGET].map(RISK_MAPPING).to_numpy()
+    weights = data['sample_weight'].to_numpy()
+    # Rows with the same features (duplicates or label conflicts) must not straddle a split
+    groups = data.groupby(feature_columns, sort=False).ngroup().to_numpy()
+
+    train_idx, test_idx = split(X, y, groups)
+    X_train, X_test = X.iloc[train_idx], X.iloc[test_idx]
+    y_train, y_test = y[train_idx], y[test_idx]
+    w_train, w_test = weights[train_idx], weights[test_idx]
+
+    print(f"\nTraining set: {len(train_idx)} rows (weight {w_train.sum()})")
+    print(f"Test set: {len(test_idx)} rows (weight {w_test.sum()})")
+
+    scaler = StandardScaler()
+    X_train_scaled = scaler.fit_transform(X_train, sample_weight=w_train)
+    X_test_scaled = scaler.transform(X_test)
+
+    results = []
+    for name, candidate in MODELS.items():
+        print(f"\n{'='*70}")
+        print(f"Training: {name}")
+        print(f"{'='*70}")
+
+        model = fit_weighted(candidate, X_train_scaled, y_train, w_train)
+        accuracy = accuracy_score(y_test, model.predict(X_test_scaled), sample_weight=w_test)
+        cv_scores = weighted_cross_val_score(candidate, X_train_scaled, y_train, w_train, groups[train_idx])
+
+        print(f"Accuracy: {accuracy*100:.2f}%")
+        print(f"CV Score: {cv_scores.mean()*100:.2f}% (+/- {cv_scores.std()*100:.2f}%)")
+
+        results.append({
+            'Model': name,
+            'Accuracy': accuracy,
+            'CV_Mean': cv_scores.mean(),
+            'CV_Std': cv_scores.std(),
+            'model_object': model
+        })
+
+    results_df = pd.DataFrame(results).sort_values('Accuracy', ascending=False)
+    best = results_df.iloc[0]
+
+    print(f"\n{'='*70}")
+    print("COMPARISON RESULTS")
+    print(f"{'='*70}")
+    print(results_df[['Model', 'Accuracy', 'CV_Mean', 'CV_Std']].to_string(index=False))
+    print(f"\n🏆 BEST MODEL: {best['Model']}")
+
+    if save:
+        os.makedirs(MODELS_DIR, exist_ok=True)
+        for filename, obj in [('best_model.pkl', best['model_object']),
+                              ('scaler.pkl', scaler),
+                              ('risk_mapping.pkl', RISK_MAPPING),
+                              ('feature_names.pkl', feature_columns)]:
+            with open(os.path.join(MODELS_DIR, filename), 'wb') as f:
+                pickle.dump(obj, f)
+
+        os.makedirs(PROCESSED_DIR, exist_ok=True)
+        X_train.to_csv(os.path.join(PROCESSED_DIR, 'X_train.csv'), index=False)
+        X_test.to_csv(os.path.join(PROCESSED_DIR, 'X_test.csv'), index=False)
+        pd.Series(y_train, name=TARGET).to_csv(os.path.join(PROCESSED_DIR, 'Y_train.csv'), index=False)
+        pd.Series(y_test, name=TARGET).to_csv(os.path.join(PROCESSED_DIR, 'Y_test.csv'), index=False)
+        np.save(os.path.join(PROCESSED_DIR, 'X_train_scaled.npy'), X_train_scaled)
+        np.save(os.path.join(PROCESSED_DIR, 'X_test_scaled.npy'), X_test_scaled)
+        np.save(os.path.join(PROCESSED_DIR, 'y_train.npy'), y_train)
+        np.save(os.path.join(PROCESSED_DIR, 'y_test.npy'), y_test)
+        np.save(os.path.join(PROCESSED_DIR, 'w_train.npy'), w_train)
+        np.save(os.path.join(PROCESSED_DIR, 'w_test.npy'), w_test)
+        print(f"\nSAVED: {MODELS_DIR}/ and {PROCESSED_DIR}/")
+
+    return results_df
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the maternal health risk model")
+    parser.add_argument('--no-dedupe', action='store_true',
+                        help="Train on every row instead of unique rows with sample weights")
+    parser.add_argument('--save', action='store_true',
+                        help="Overwrite the model bundle and processed data")
+    args = parser.parse_args()
+
+    train(dedupe=not args.no_dedupe, save=args.save)